@@ -1,21 +1,30 @@
 #!/usr/bin/env python3
 
-from argparse import ArgumentParser
+from argparse import ArgumentParser, ArgumentTypeError
 from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
 from datetime import datetime, timedelta, timezone
-from functools import wraps
+from functools import partial, wraps
 from http import HTTPStatus
+from itertools import islice
+from json import loads as json_loads
 from logging import getLogger as get_logger, Logger
 from logging.config import fileConfig as logger_config_file
+from logging.handlers import RotatingFileHandler
+from math import ceil
+from multiprocessing import current_process
 from os import environ as environment, makedirs
-from os.path import join as path
-from typing import Any, Callable, Final
-
-from dateutil.parser import parse as parse_date
-from flatdict import FlatDict
-from github import Github, PaginatedList, UnknownObjectException
-from interval import Interval
-from pymongo import DESCENDING as DESC, MongoClient
+from os.path import dirname, join as path
+from threading import local
+from time import time
+from typing import Any, Callable, Final, Iterator, NamedTuple
+from urllib.parse import quote
+
+from github import Github, UnknownObjectException
+from github.Requester import Requester
+from orjson import JSONDecodeError, loads as orjson_loads
+from pymongo import ASCENDING as ASC, DESCENDING as DESC, MongoClient, ReplaceOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
 from pymongo.results import InsertManyResult
 from urllib3.response import BaseHTTPResponse
 from urllib3.util.retry import Retry
@@ -32,6 +41,33 @@ def init_logger() -> Logger:
 logger: Final = init_logger()
 
 
+def init_file_handler(filename: str):
+    """
+    Replace the rotating file handler of the root logger with an
+    equivalently configured one, which writes to a different file
+    in the same directory. Since log files can not be safely rotated
+    by multiple processes, each process should write to its own file.
+
+    :param filename: The name of the new log file.
+    :type filename: str
+    """
+    root = get_logger()
+    for handler in root.handlers:
+        if isinstance(handler, RotatingFileHandler):
+            replacement = RotatingFileHandler(
+                filename=path(dirname(handler.baseFilename), filename),
+                mode=handler.mode,
+                maxBytes=handler.maxBytes,
+                backupCount=handler.backupCount,
+            )
+            replacement.setLevel(handler.level)
+            replacement.setFormatter(handler.formatter)
+            root.removeHandler(handler)
+            handler.close()
+            root.addHandler(replacement)
+            break
+
+
 def round_datetime(function: Callable[..., datetime]) -> Callable[..., datetime]:
     """
     Round the microsecond component of a datetime object
@@ -52,12 +88,82 @@ def round_datetime(function: Callable[..., datetime]) -> Callable[..., datetime]
     @wraps(function)
     def _wrapper(*args, **kwargs):
         dt: datetime = function(*args, **kwargs)
-        if dt.microsecond >= 500_000:
-            dt += timedelta(seconds=1)
-        return dt.replace(microsecond=0)
+        if dt.microsecond == 0:
+            return dt
+        elif dt.tzinfo is None:
+            # Naive timestamps are interpreted in local time, so these are rounded field-wise instead
+            if dt.microsecond >= 500_000:
+                dt += timedelta(seconds=1)
+            return dt.replace(microsecond=0)
+        return datetime.fromtimestamp(int(dt.timestamp() + 0.5), tz=dt.tzinfo)
     return _wrapper
 
 
+def format_datetime(dt: datetime) -> str:
+    """
+    Format a datetime object as a UTC timestamp with second precision,
+    in the form of ``YYYY-MM-DDTHH:MM:SSZ`` expected by the GitHub search syntax.
+    Offset-aware datetime objects are converted to UTC beforehand,
+    while naive ones are assumed to already be in UTC.
+
+    :param dt: The datetime object to format.
+    :type dt: datetime
+    :returns: The formatted timestamp.
+    :rtype: str
+    """
+    if dt.utcoffset():
+        dt = dt.astimezone(timezone.utc)
+    return dt.isoformat(timespec='seconds')[:19] + 'Z'
+
+
+def parse_datetime(timestamp: str) -> datetime:
+    """
+    Parse an ISO 8601 timestamp, such as the ones found in GitHub API responses.
+    The ``Z`` suffix denoting UTC is also accepted,
+    which is not the case with :py:meth:`datetime.fromisoformat` prior to Python 3.11.
+
+    :param timestamp: The timestamp to parse.
+    :type timestamp: str
+    :returns: The parsed datetime object.
+    :rtype: datetime
+    """
+    if timestamp.endswith('Z'):
+        timestamp = timestamp[:-1] + '+00:00'
+    return datetime.fromisoformat(timestamp)
+
+
+def structured_from_json(_: Requester, data: str | bytes) -> Any:
+    """
+    Replacement for the private method of the PyGithub :py:class:`Requester`
+    responsible for decoding response bodies, which relies on :py:mod:`orjson`
+    instead of the standard library :py:mod:`json` module. Bodies rejected by
+    :py:mod:`orjson` (e.g. strings containing lone surrogate escapes) are decoded
+    with :py:mod:`json` as before, so the behaviour of the original method is retained.
+
+    :param data: The raw response body.
+    :type data: str | bytes
+    :returns: The decoded response body.
+    :rtype: Any
+    """
+    if len(data) == 0:
+        return None
+    try:
+        return orjson_loads(data)
+    except JSONDecodeError:
+        pass
+    if isinstance(data, bytes):
+        data = data.decode('utf-8')
+    try:
+        return json_loads(data)
+    except ValueError:
+        if data.startswith('{') or data.startswith('['):
+            raise
+        return {'data': data}
+
+
+setattr(Requester, '_Requester__structuredFromJson', structured_from_json)
+
+
 class TimeDifferenceTooSmallException(ValueError):
     """
     Exception raised when the timedelta between two datetime objects is less than a certain value.`
@@ -65,6 +171,45 @@ class TimeDifferenceTooSmallException(ValueError):
     pass
 
 
+class DateInterval(NamedTuple):
+    """
+    Closed interval between two datetime objects. Alongside the bounds themselves,
+    it also holds their string representations, which are formatted only once
+    using :py:func:`format_datetime` when the interval is created.
+    """
+    lower: datetime
+    upper: datetime
+    lower_str: str
+    upper_str: str
+
+    @classmethod
+    def between(cls, lower: datetime, upper: datetime) -> 'DateInterval':
+        return cls(lower, upper, format_datetime(lower), format_datetime(upper))
+
+    def split(self, *bounds: datetime) -> list['DateInterval']:
+        """
+        Split the interval into consecutive sub-intervals at the given datetime objects.
+        The formatted representations of the outer bounds are reused by the sub-intervals.
+
+        :param bounds:
+            Datetime objects that fall within the interval, in ascending order.
+        :type bounds: datetime
+        :returns:
+            The sub-intervals, in ascending order.
+        :rtype: list[DateInterval]
+        """
+        lowers = [(self.lower, self.lower_str)]
+        lowers.extend((bound, format_datetime(bound)) for bound in bounds)
+        uppers = lowers[1:] + [(self.upper, self.upper_str)]
+        return [
+            DateInterval(lower, upper, lower_str, upper_str)
+            for (lower, lower_str), (upper, upper_str) in zip(lowers, uppers)
+        ]
+
+    def __str__(self):
+        return f'{self.lower_str}..{self.upper_str}'
+
+
 class GitHubRetry(Retry):
     """
     Subclass of :py:class:`Retry` from the :py:mod:`urllib3` package,
@@ -74,29 +219,34 @@ class GitHubRetry(Retry):
     :ref:`Based on <https://github.com/PyGithub/PyGithub/issues/1989#issuecomment-1261656811>`
     """
 
+    #: Response statuses for which requests are retried, unless specified otherwise
+    DEFAULT_STATUS_FORCELIST: Final = frozenset({
+        HTTPStatus.FORBIDDEN.value,                 # 403
+        HTTPStatus.TOO_MANY_REQUESTS.value,         # 429
+        HTTPStatus.INTERNAL_SERVER_ERROR.value,     # 500
+        HTTPStatus.NOT_IMPLEMENTED.value,           # 501
+        HTTPStatus.BAD_GATEWAY.value,               # 502
+        HTTPStatus.SERVICE_UNAVAILABLE.value,       # 503
+        HTTPStatus.GATEWAY_TIMEOUT.value,           # 504
+    })
+
     def __init__(self, *args, **kwargs):
-        if len(args) < 2 and 'status_forcelist' not in kwargs:
-            kwargs['status_forcelist'] = frozenset({
-                HTTPStatus.FORBIDDEN.value,                 # 403
-                HTTPStatus.TOO_MANY_REQUESTS.value,         # 429
-                HTTPStatus.INTERNAL_SERVER_ERROR.value,     # 500
-                HTTPStatus.NOT_IMPLEMENTED.value,           # 501
-                HTTPStatus.BAD_GATEWAY.value,               # 502
-                HTTPStatus.SERVICE_UNAVAILABLE.value,       # 503
-                HTTPStatus.GATEWAY_TIMEOUT.value,           # 504
-            })
+        if len(args) < 2:
+            kwargs.setdefault('status_forcelist', self.DEFAULT_STATUS_FORCELIST)
         super(GitHubRetry, self).__init__(*args, **kwargs)
 
     def get_retry_after(self, response: BaseHTTPResponse):
         if response.status == HTTPStatus.FORBIDDEN.value:
-            reset_header = response.headers['X-RateLimit-Reset']
-            reset_time = datetime.fromtimestamp(int(reset_header))
-            retry_after = max((reset_time - datetime.now()).total_seconds() + 1, 0)
+            # Secondary rate limits specify their own wait time, which is far shorter than the primary reset
+            retry_after = super().get_retry_after(response)
+            if retry_after is None:
+                reset_header = response.headers['X-RateLimit-Reset']
+                retry_after = max(int(reset_header) - int(time()) + 1, 0)
             logger.info('Rate limit exceeded, sleeping for %s...', timedelta(seconds=retry_after))
             return retry_after
         else:
             logger.warning('Unexpected response status [%s], reverting to default retry behaviour...', response.status)
-            super().get_retry_after(response)
+            return super().get_retry_after(response)
 
 
 class Miner:
@@ -104,55 +254,144 @@ class Miner:
     #: Maximum allowed page size offered by the GitHub API
     MAX_PAGE_SIZE: Final = 100
 
-    #: Maximum number of results obtainable when performing API searches
-    MAX_RESULT_COUNT: Final = MAX_PAGE_SIZE * 10
-
-    #: The default string timestamp format
-    TIMESTAMP_FORMAT: Final = '%Y-%m-%dT%H:%M:%SZ'
+    #: Maximum number of pages obtainable when performing API searches
+    MAX_PAGE_COUNT: Final = 10
 
-    def __init__(self, token: str, target: str, keyword: str):
-        self._api = Github(
-            login_or_token=token,
-            retry=(GitHubRetry()),
-            per_page=self.MAX_PAGE_SIZE,
-        )
+    #: Maximum number of results obtainable when performing API searches
+    MAX_RESULT_COUNT: Final = MAX_PAGE_SIZE * MAX_PAGE_COUNT
+
+    #: Headroom applied to the number of sections a saturated interval is split into,
+    #: since the results are rarely spread evenly across the interval
+    SPLIT_HEADROOM: Final = 1.3
+
+    #: Number of matches expected for an interval, above which it is split without being searched first
+    PREDICTION_THRESHOLD: Final = MAX_RESULT_COUNT * 0.8
+
+    #: Weight given to the most recently observed match density when updating its moving average
+    DENSITY_SMOOTHING: Final = 0.3
+
+    #: Number of results stored in the database at once
+    STORE_BATCH_SIZE: Final = 250
+
+    #: Paths to the creation date fields of the mined documents, for each of the supported targets
+    DATE_PATHS: Final = {
+        'commits': 'commit.committer.date',
+        'issues': 'created_at',
+        'pull-requests': 'created_at',
+    }
+
+    #: Paths to the fields uniquely identifying the mined documents, for each of the supported targets
+    KEY_PATHS: Final = {
+        # The completed commit payloads carry no repository field, but their API URL names both it and the SHA
+        'commits': ('url',),
+        'issues': ('id',),
+        'pull-requests': ('id',),
+    }
+
+    #: Error code reported by MongoDB for writes violating a unique index
+    DUPLICATE_KEY_ERROR: Final = 11000
+
+    def __init__(self, token: str, target: str, keyword: str, workers: int = 1, fetchers: int = 1):
+        if target not in self.DATE_PATHS:
+            raise ValueError(f'Mining not implemented for \'{target}\'')
+        self._token = token
+        self._local = local()
         self._client = MongoClient(
             appname=f'crawler-{target}-{keyword}',
             host=environment.get('DATABASE_HOST', 'localhost'),
             port=int(environment.get('DATABASE_PORT', '27017')),
+            tz_aware=True,
         )
         self._database = self._client.get_database(keyword)
         self._collection = self._database[target]
+        self._checkpoints = self._database['_crawler_state']
+        self._checkpoints.create_index([('target', ASC), ('lower', DESC)])
         self._target = target
         self._keyword = keyword
+        self._date_path = self.DATE_PATHS[target]
+        self._collection.create_index([(self._date_path, DESC)])
+        self._init_unique_index()
+        self._workers = workers
+        self._density = None
+        self._fetchers = min(fetchers, self.MAX_PAGE_COUNT)
+        # The thread mining an interval fetches pages as well, so the pool only provides the remaining fetchers
+        self._fetcher = ThreadPoolExecutor(max_workers=max(self._fetchers - 1, 1) * workers)
         self._init_functions()
         self._init_queue()
 
+    @property
+    def _api(self) -> Github:
+        # The PyGithub requester shares a single connection object that is not thread-safe,
+        # so each of the worker threads has to be given a client instance of its own.
+        # As a client only ever has one request in flight, a single kept-alive connection
+        # is all it needs to avoid repeating the TLS handshake on subsequent requests.
+        api = getattr(self._local, 'api', None)
+        if api is None:
+            api = Github(
+                login_or_token=self._token,
+                retry=(GitHubRetry()),
+                per_page=self.MAX_PAGE_SIZE,
+                pool_size=1,
+            )
+            self._local.api = api
+        return api
+
+    def _init_unique_index(self):
+        # Results that were already stored before an interrupted run are then skipped when it is resumed.
+        # Creating an index that already exists is a no-op, but failing to create one due to duplicates
+        # scans the entire collection, so such failures are recorded and not reattempted on each run.
+        keys = self.KEY_PATHS[self._target]
+        marker = f'{self._target}:unique-index'
+        if self._checkpoints.find_one({'_id': marker}) is None:
+            try:
+                self._collection.create_index([(key, ASC) for key in keys], unique=True)
+                return
+            except DuplicateKeyError as dke:
+                self._checkpoints.replace_one(
+                    filter={'_id': marker},
+                    replacement={'error': str(dke)},
+                    upsert=True,
+                )
+        logger.warning(
+            'Collection %s contains %s with duplicate %s, which prevents skipping results already stored when resuming. '
+            'To fix this, remove the duplicates and delete the \'%s\' document from %s before the next run.',
+            self._collection.full_name, self._target, ', '.join(keys), marker, self._checkpoints.full_name,
+        )
+
     def _init_functions(self):
         setattr(self, '_search', self._init_search_function())
         setattr(self, '_store', self._init_store_function())
 
     def _init_search_function(self):
-        match self._target:
-            case 'commits':
-                return lambda interval: self._api.search_commits(
-                    query=f'{self._keyword} committer-date:{interval}',
-                    sort='committer-date',
-                    order='asc',
-                )
-            case 'issues' | 'pull-requests':
-                return lambda interval: self._api.search_issues(
-                    query=f'{self._keyword} created:{interval} is:{self._target[:-1]}',
-                    sort='created',
-                    order='asc',
-                )
-            case _:
-                raise ValueError(f'Mining not implemented for \'{self._target}\'')
+        # Searches are performed through the REST API rather than GraphQL: the latter does
+        # not support searching commits, is subject to the same cap of 1000 results per query,
+        # and returns documents shaped differently from the REST payloads already stored
+        return {
+            'commits': lambda interval: self._api.search_commits(
+                query=f'{self._keyword} committer-date:{interval}',
+                sort='committer-date',
+                order='asc',
+            ),
+            'issues': lambda interval: self._api.search_issues(
+                query=f'{self._keyword} created:{interval} is:{self._target[:-1]}',
+                sort='created',
+                order='asc',
+            ),
+            'pull-requests': lambda interval: self._api.search_issues(
+                query=f'{self._keyword} created:{interval} is:{self._target[:-1]}',
+                sort='created',
+                order='asc',
+            ),
+        }[self._target]
 
     def _init_store_function(self):
-        return lambda results: self._collection.insert_many(results)
+        return lambda results: self._collection.insert_many(
+            results,
+            ordered=False,
+            bypass_document_validation=True,
+        )
 
-    def _convert(self, results: PaginatedList):
+    def _complete(self, results: list) -> list[dict]:
         converted = []
         for result in results:
             try:
@@ -161,42 +400,90 @@ class Miner:
                 logger.warning('%s returned when requesting %s data: %s', uoe.status, self._target, uoe.data)
         return converted
 
+    def _fetch_page(self, interval: str, page: int) -> list[dict]:
+        # The search is re-issued so that the page is requested through the client of the fetching thread
+        return self._complete(self._search(interval).get_page(page))
+
+    def _convert(self, interval: str, total: int, first_page: list) -> Iterator[dict]:
+        pages = ceil(min(total, self.MAX_RESULT_COUNT) / self.MAX_PAGE_SIZE)
+        fetch = partial(self._fetch_page, interval)
+        remaining = iter(range(1, pages))
+        # Only a bounded number of pages is requested ahead, with the next one submitted as each is consumed
+        prefetched = deque(self._fetcher.submit(fetch, page) for page in islice(remaining, self._fetchers - 1))
+        yield from self._complete(first_page)
+        for page in remaining:
+            if len(prefetched):
+                prefetched.append(self._fetcher.submit(fetch, page))
+                yield from prefetched.popleft().result()
+            else:
+                yield from fetch(page)
+        while len(prefetched):
+            yield from prefetched.popleft().result()
+
     def _init_queue(self):
         self._queue = deque()
-        interval = Interval.between(self._lower_date(), self._upper_date_default())
-        self._queue.append(interval)
+        # Intervals are resumed from the earliest, which is the last to be popped off the queue
+        checkpoints = self._checkpoints.find(
+            filter={'target': self._target},
+            sort=[('lower', DESC)],
+        )
+        self._queue.extend(DateInterval.between(checkpoint['lower'], checkpoint['upper']) for checkpoint in checkpoints)
+        if len(self._queue):
+            logger.info('Resuming from checkpoint with %s remaining intervals...', len(self._queue))
+        else:
+            interval = DateInterval.between(self._lower_date(), self._upper_date_default())
+            self._enqueue([interval])
+
+    def _checkpoint_id(self, interval: DateInterval) -> str:
+        return f'{self._target}:{interval}'
+
+    def _enqueue(self, intervals: list[DateInterval], replaced: DateInterval | None = None):
+        # Each pending interval is checkpointed as a document of its own, which is kept until the interval
+        # is either mined or replaced by its sections. Upserts keep this idempotent across resumed runs.
+        if len(intervals):
+            self._checkpoints.bulk_write([
+                ReplaceOne(
+                    filter={'_id': self._checkpoint_id(interval)},
+                    replacement={'target': self._target, 'lower': interval.lower, 'upper': interval.upper},
+                    upsert=True,
+                )
+                for interval in intervals
+            ], ordered=False)
+        if replaced is not None:
+            self._checkpoints.delete_one({'_id': self._checkpoint_id(replaced)})
+        self._queue.extend(reversed(intervals))
 
     @round_datetime
     def _lower_date(self) -> datetime:
-        match self._target:
-            case 'commits':
-                path = 'commit.committer.date'
-            case 'issues' | 'pull-requests':
-                path = 'created_at'
-            case _:
-                raise ValueError(f'Mining not implemented for \'{self._target}\'')
+        path = self._date_path
         lower_search = self._collection.find(
             filter={},
             projection={'_id': 0, path: 1},
             sort=[(path, DESC)],
             limit=1,
+            hint=[(path, DESC)],
         )
-        lower_date_default_str = self._lower_date_default().strftime(Miner.TIMESTAMP_FORMAT)
+        lower_date_default_str = format_datetime(self._lower_date_default())
         lower_date_default_doc = self._construct_dict(path, lower_date_default_str)
         lower_date_doc = next(lower_search, lower_date_default_doc)
         lower_date_str = self._destruct_dict(path, lower_date_doc)
-        return parse_date(lower_date_str)
+        return parse_datetime(lower_date_str)
 
     @staticmethod
     def _construct_dict(path: str, value: Any) -> dict:
-        fd = FlatDict({}, delimiter='.')
-        fd[path] = value
-        return fd.as_dict()
+        *parents, leaf = path.split('.')
+        d = current = {}
+        for key in parents:
+            current[key] = {}
+            current = current[key]
+        current[leaf] = value
+        return d
 
     @staticmethod
     def _destruct_dict(path: str, d: dict) -> Any:
-        fd = FlatDict(d, delimiter='.')
-        return fd[path]
+        for key in path.split('.'):
+            d = d[key]
+        return d
 
     @staticmethod
     @round_datetime
@@ -209,53 +496,160 @@ class Miner:
         return datetime.now(tz=timezone.utc)
 
     @staticmethod
-    @round_datetime
     def _median_date(lower: datetime, upper: datetime) -> datetime:
-        delta = upper - lower
-        if delta.seconds <= 1:
+        lower_ts = int(lower.timestamp())
+        upper_ts = int(upper.timestamp())
+        if upper_ts - lower_ts <= 1:
             raise TimeDifferenceTooSmallException
-        lower_ts = lower.timestamp()
-        upper_ts = upper.timestamp()
-        median_ts = (lower_ts + upper_ts) / 2
+        median_ts = (lower_ts + upper_ts) // 2
         return datetime.fromtimestamp(median_ts, tz=timezone.utc)
 
+    @classmethod
+    def _partition_dates(cls, lower: datetime, upper: datetime, parts: int) -> list[datetime]:
+        lower_ts = int(lower.timestamp())
+        upper_ts = int(upper.timestamp())
+        parts = min(parts, upper_ts - lower_ts)
+        if parts < 2:
+            raise TimeDifferenceTooSmallException
+        elif parts == 2:
+            return [cls._median_date(lower, upper)]
+        return [
+            datetime.fromtimestamp(lower_ts + (upper_ts - lower_ts) * i // parts, tz=timezone.utc)
+            for i in range(1, parts)
+        ]
+
+    def _observe(self, interval: DateInterval, total: int):
+        seconds = (interval.upper - interval.lower).total_seconds()
+        if seconds <= 0:
+            return
+        density = total / seconds
+        if self._density is None:
+            self._density = density
+        else:
+            self._density = self.DENSITY_SMOOTHING * density + (1 - self.DENSITY_SMOOTHING) * self._density
+
+    def _presplit(self, interval: DateInterval) -> list[DateInterval]:
+        if self._density is None:
+            return [interval]
+        predicted = self._density * (interval.upper - interval.lower).total_seconds()
+        if predicted <= self.PREDICTION_THRESHOLD:
+            return [interval]
+        try:
+            parts = max(2, ceil(predicted / self.MAX_RESULT_COUNT * self.SPLIT_HEADROOM))
+            bounds = self._partition_dates(interval.lower, interval.upper, parts)
+        except TimeDifferenceTooSmallException:
+            return [interval]
+        logger.info('Expecting %d %s in interval %s, splitting into %s smaller sections', predicted, self._target, interval, len(bounds) + 1)
+        return interval.split(*bounds)
+
+    def _mine(self, interval: DateInterval) -> tuple[int, list[DateInterval]]:
+        interval_str = str(interval)
+        logger.info('Examining interval: %s', interval_str)
+        results = self._search(interval_str)
+        # Fetching the first page sets the total from the response body, which unlike the
+        # count derived from pagination is not capped (see: https://github.com/PyGithub/PyGithub/issues/1309)
+        first_page = results.get_page(0)
+        total = results.totalCount if len(first_page) else 0
+        logger.info('  Matched %s %s in %s...', total, self._target, interval_str)
+        if total == 0:
+            logger.info('  Skipping %s', interval_str)
+            return total, []
+        elif total > self.MAX_RESULT_COUNT:
+            try:
+                parts = max(2, ceil(total / self.MAX_RESULT_COUNT * self.SPLIT_HEADROOM))
+                bounds = self._partition_dates(interval.lower, interval.upper, parts)
+                logger.info('  Splitting %s into %s smaller sections', interval_str, len(bounds) + 1)
+                return total, interval.split(*bounds)
+            except TimeDifferenceTooSmallException:
+                logger.warning('  %s could not be split further, mining to minimize data loss...', interval_str)
+        count = 0
+        raw_results = self._convert(interval_str, total, first_page)
+        while batch := list(islice(raw_results, self.STORE_BATCH_SIZE)):
+            try:
+                stored: InsertManyResult = self._store(batch)
+                count += len(stored.inserted_ids)
+            except BulkWriteError as bwe:
+                count += bwe.details['nInserted']
+                errors = bwe.details['writeErrors']
+                duplicates = sum(error['code'] == self.DUPLICATE_KEY_ERROR for error in errors)
+                if duplicates:
+                    logger.info('  Skipped %s already stored %s from %s', duplicates, self._target, interval_str)
+                if len(errors) > duplicates:
+                    logger.warning('  Failed to store %s out of %s %s from %s', len(errors) - duplicates, len(batch), self._target, interval_str)
+        logger.info('  Stored %s %s from %s', count, self._target, interval_str)
+        return total, []
+
     def __call__(self, *args, **kwargs):
         logger.info('Mining %s containing keyword %s...', self._target, self._keyword)
-        while len(self._queue):
-            interval = self._queue.pop()
-            lower = interval.lower_bound
-            upper = interval.upper_bound
-            lower_str = lower.strftime(Miner.TIMESTAMP_FORMAT)
-            upper_str = upper.strftime(Miner.TIMESTAMP_FORMAT)
-            interval_str = f'{lower_str}..{upper_str}'
-            logger.info('Examining interval: %s', interval_str)
-            results = self._search(interval_str)
-            if results.totalCount == self.MAX_RESULT_COUNT:
-                results[0]  # see: https://github.com/PyGithub/PyGithub/issues/1309
-            total = results.totalCount
-            logger.info('  Matched %s %s...', total, self._target)
-            if total == 0:
-                logger.info('  Skipping')
-                continue
-            elif total > self.MAX_RESULT_COUNT:
-                try:
-                    median = self._median_date(lower, upper)
-                    logger.info('  Splitting into two smaller sections')
-                    self._queue.append(Interval.between(median, upper))
-                    self._queue.append(Interval.between(lower, median))
-                    continue
-                except TimeDifferenceTooSmallException:
-                    logger.warning('  Could not be split further, mining to minimize data loss...')
-            raw_results = self._convert(results)
-            stored: InsertManyResult = self._store(raw_results)
-            logger.info('  Stored %s %s', len(stored.inserted_ids), self._target)
+        try:
+            with self._fetcher, ThreadPoolExecutor(max_workers=self._workers) as executor:
+                pending = {}
+                while len(self._queue) or len(pending):
+                    while len(self._queue) and len(pending) < self._workers:
+                        interval = self._queue.pop()
+                        sections = self._presplit(interval)
+                        if len(sections) > 1:
+                            self._enqueue(sections, replaced=interval)
+                            continue
+                        pending[executor.submit(self._mine, interval)] = interval
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        interval = pending.pop(future)
+                        total, sections = future.result()
+                        self._observe(interval, total)
+                        self._enqueue(sections, replaced=interval)
+        finally:
+            self._client.close()
         logger.info('Done!')
 
 
+def positive_int(value: str) -> int:
+    """
+    Parse a command line argument as a strictly positive integer.
+
+    :param value: The command line argument.
+    :type value: str
+    :returns: The parsed integer.
+    :rtype: int
+    :raises ArgumentTypeError: If the argument is not an integer greater than zero.
+    """
+    number = int(value)
+    if number < 1:
+        raise ArgumentTypeError(f'must be a positive integer, got {number}')
+    return number
+
+
+def mine(token: str, target: str, keywords: list[str], workers: int, fetchers: int):
+    """
+    Mine the given keywords one after another, using the same access token.
+    Intended to be run in a separate process for each token, which is named
+    after the keyword being mined, and logs to a separate file for each of them.
+
+    :param token: The GitHub access token to be used in mining.
+    :type token: str
+    :param target: The GitHub Search API mining endpoint.
+    :type target: str
+    :param keywords: The keywords to mine, in order.
+    :type keywords: list[str]
+    :param workers: The number of search intervals mined concurrently.
+    :type workers: int
+    :param fetchers: The number of result pages fetched concurrently.
+    :type fetchers: int
+    """
+    for keyword in keywords:
+        current_process().name = keyword
+        init_file_handler(f'crawler-{quote(keyword, safe="")}.log')
+        miner = Miner(token, target, keyword, workers, fetchers)
+        miner()
+
+
 if __name__ == '__main__':
     parser: Final = ArgumentParser()
     parser.add_argument(
         '--token',
+        '--tokens',
+        dest='tokens',
+        type=lambda value: value.split(','),
         required=False,
         default=environment.get("GITHUB_TOKEN"),
         help="""
@@ -264,6 +658,9 @@ if __name__ == '__main__':
         Instead of passing the token through the command line,
         you can use the `GITHUB_TOKEN` environment variable.
         You can do so at: https://github.com/settings/tokens
+        Multiple tokens can be provided as a comma-separated
+        list, in which case the keywords are mined in parallel,
+        with one process per token.
         """
     )
     parser.add_argument(
@@ -278,15 +675,54 @@ if __name__ == '__main__':
         """
     )
     parser.add_argument(
-        'keyword',
+        '--workers',
+        type=positive_int,
+        required=False,
+        default=1,
+        help="""
+        The number of search intervals that
+        will be mined concurrently. Defaults
+        to 1, i.e. intervals are processed
+        one after another.
+        """
+    )
+    parser.add_argument(
+        '--fetchers',
+        type=positive_int,
+        required=False,
+        default=1,
+        help="""
+        The number of result pages of an
+        interval that will be fetched
+        concurrently, up to 10. Defaults
+        to 1, i.e. pages are fetched one
+        after another.
+        """
+    )
+    parser.add_argument(
+        'keywords',
+        nargs='+',
+        metavar='keyword',
         help="""
         The case-insensitive keyword that will
         be targeted throughout the search.
         The script will retrieve all available
         entities that contain the keyword on
-        the specified endpoint.
+        the specified endpoint. Multiple keywords
+        are mined independently of one another.
         """
     )
     args = parser.parse_args()
-    miner = Miner(args.token, args.target, args.keyword)
-    miner()
+    tokens = (args.tokens or [None])[:len(args.keywords)]
+    if len(args.keywords) == 1:
+        current_process().name = args.keywords[0]
+        miner = Miner(tokens[0], args.target, args.keywords[0], args.workers, args.fetchers)
+        miner()
+    else:
+        with ProcessPoolExecutor(max_workers=len(tokens)) as executor:
+            futures = [
+                executor.submit(mine, token, args.target, args.keywords[i::len(tokens)], args.workers, args.fetchers)
+                for i, token in enumerate(tokens)
+            ]
+            for future in futures:
+                future.result()